@@ -88,8 +88,7 @@ def main():
     # Example 4: Find places by location
     print("\n4. Finding places near Central Park (within 2km)...")
     nearby_places = db.get_places_by_location(40.7829, -73.9654, radius_km=2.0)
-    for place in nearby_places:
-        distance = getattr(place, 'distance', 'Unknown')
+    for place, distance in nearby_places:
         print(f"   🗺️  {place.name} - {distance:.2f}km away")
     
     # Example 5: Get places by tag
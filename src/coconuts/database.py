@@ -1,12 +1,211 @@
 import sqlite3
 import json
-from typing import List, Dict, Optional, Any
+import math
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Any, Tuple, Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 import os
 
+try:
+    import numpy as np
+except ImportError:  # optional, only speeds up distance filtering
+    np = None
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library json module
+    orjson = None
+
+
+# Statements are kept as module constants so the connection's statement cache reuses
+# the compiled form instead of re-parsing identical SQL on every call.
+_SQL_INSERT_PLACE = """
+    INSERT INTO saved_places 
+    (name, address, latitude, longitude, place_id, types, rating, 
+     user_ratings_total, price_level, website, phone_number, 
+     opening_hours, photos, notes, tags, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Updates an existing place with the same Google Place ID in place, keeping its id and
+# created_at, instead of deleting and re-inserting it like INSERT OR REPLACE
+_SQL_UPSERT_PLACE = _SQL_INSERT_PLACE + """
+    ON CONFLICT(place_id) DO UPDATE SET
+    name = excluded.name, address = excluded.address, latitude = excluded.latitude,
+    longitude = excluded.longitude, types = excluded.types, rating = excluded.rating,
+    user_ratings_total = excluded.user_ratings_total, price_level = excluded.price_level,
+    website = excluded.website, phone_number = excluded.phone_number,
+    opening_hours = excluded.opening_hours, photos = excluded.photos, notes = excluded.notes,
+    tags = excluded.tags, updated_at = excluded.updated_at
+"""
+_SQL_UPSERT_PLACE_RETURNING_ID = _SQL_UPSERT_PLACE + " RETURNING id"
+_SQL_GET_BY_ID = "SELECT * FROM saved_places WHERE id = ?"
+_SQL_GET_BY_PLACE_ID = "SELECT * FROM saved_places WHERE place_id = ?"
+
+# List queries come in two variants: full rows for SavedPlace and the summary columns
+_SELECT_BY_IDS = "SELECT {columns} FROM saved_places sp WHERE sp.id IN (SELECT value FROM json_each(?))"
+_SELECT_ALL = "SELECT {columns} FROM saved_places sp ORDER BY sp.created_at DESC"
+_SELECT_SEARCH = """
+    SELECT {columns} FROM saved_places_fts f
+    JOIN saved_places sp ON sp.id = f.rowid
+    WHERE saved_places_fts MATCH ?
+    ORDER BY bm25(saved_places_fts)
+"""
+_SELECT_BY_TAG = """
+    SELECT {columns} FROM place_tags t
+    JOIN saved_places sp ON sp.id = t.place_id
+    WHERE t.tag = ?
+    ORDER BY sp.created_at DESC
+"""
+
+# Fields returned by the list endpoints, which don't need the full place
+SUMMARY_FIELDS = ("id", "name", "address", "latitude", "longitude", "rating", "tags", "created_at")
+_SUMMARY_COLUMNS = ", ".join(f"sp.{field}" for field in SUMMARY_FIELDS)
+
+_SQL_GET_BY_IDS = _SELECT_BY_IDS.format(columns="sp.*")
+_SQL_ALL_PLACES = _SELECT_ALL.format(columns="sp.*")
+_SQL_ALL_PLACES_PAGE = _SQL_ALL_PLACES + " LIMIT ? OFFSET ?"
+_SQL_SEARCH = _SELECT_SEARCH.format(columns="sp.*")
+_SQL_SEARCH_LIMIT = _SQL_SEARCH + " LIMIT ?"
+_SQL_PLACES_BY_TAG = _SELECT_BY_TAG.format(columns="sp.*")
+
+_SQL_SUMMARIES_BY_IDS = _SELECT_BY_IDS.format(columns=_SUMMARY_COLUMNS)
+_SQL_ALL_SUMMARIES = _SELECT_ALL.format(columns=_SUMMARY_COLUMNS)
+_SQL_ALL_SUMMARIES_PAGE = _SQL_ALL_SUMMARIES + " LIMIT ? OFFSET ?"
+_SQL_SEARCH_SUMMARIES = _SELECT_SEARCH.format(columns=_SUMMARY_COLUMNS)
+_SQL_SEARCH_SUMMARIES_LIMIT = _SQL_SEARCH_SUMMARIES + " LIMIT ?"
+_SQL_SUMMARIES_BY_TAG = _SELECT_BY_TAG.format(columns=_SUMMARY_COLUMNS)
+
+_SQL_LOCATION_CANDIDATES = """
+    SELECT sp.id, sp.latitude, sp.longitude FROM saved_places sp
+    JOIN saved_places_rtree r ON sp.id = r.id
+    WHERE r.maxLat >= ? AND r.minLat <= ? AND r.maxLon >= ? AND r.minLon <= ?
+"""
+_SQL_LOCATION_NEARBY = """
+    SELECT id, distance FROM (
+        SELECT sp.id, haversine(?, ?, sp.latitude, sp.longitude) AS distance FROM saved_places sp
+        JOIN saved_places_rtree r ON sp.id = r.id
+        WHERE r.maxLat >= ? AND r.minLat <= ? AND r.maxLon >= ? AND r.minLon <= ?
+    )
+    WHERE distance <= ?
+    ORDER BY distance
+"""
+_SQL_DELETE_PLACE = "DELETE FROM saved_places WHERE id = ?"
+# Separate subqueries so the average is read from the partial idx_rating index
+_SQL_PLACE_TOTALS = """
+    SELECT (SELECT COUNT(*) FROM saved_places),
+           (SELECT AVG(rating) FROM saved_places WHERE rating IS NOT NULL)
+"""
+_SQL_TOP_TAGS = """
+    SELECT tag, COUNT(*) AS count FROM place_tags
+    GROUP BY tag
+    ORDER BY count DESC, tag
+    LIMIT 10
+"""
+
+# Columns update_place may change; id, created_at and updated_at are managed by the database
+_UPDATABLE_COLUMNS = (
+    "name", "address", "latitude", "longitude", "place_id", "types", "rating",
+    "user_ratings_total", "price_level", "website", "phone_number",
+    "opening_hours", "photos", "notes", "tags",
+)
+_JSON_COLUMNS = frozenset(("types", "opening_hours", "photos", "tags"))
+
+# Per-connection settings: in WAL mode NORMAL sync is still corruption-safe and avoids an
+# fsync per commit, and a larger page cache / mmap window keeps hot pages out of read syscalls.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64 MB
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA busy_timeout = 5000",
+)
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+if orjson is not None:
+    def json_dumps(value: Any, indent: bool = False) -> str:
+        """Serialize value as JSON, indented by two spaces when indent is set"""
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    
+    _json_loads = orjson.loads
+else:
+    def json_dumps(value: Any, indent: bool = False) -> str:
+        """Serialize value as JSON, indented by two spaces when indent is set"""
+        # Same text as orjson writes: raw UTF-8 and, unindented, no spaces after separators
+        if indent:
+            return json.dumps(value, ensure_ascii=False, indent=2)
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    
+    _json_loads = json.loads
+
+
+def _encode_json(value: Any) -> Optional[str]:
+    """Serialize a JSON column value, storing empty lists and dicts as NULL"""
+    return json_dumps(value) if value else None
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometers between two coordinates"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing every point within radius_km"""
+    angular_radius = radius_km / _EARTH_RADIUS_KM
+    dlat = math.degrees(angular_radius)
+    min_lat = max(latitude - dlat, -90.0)
+    max_lat = min(latitude + dlat, 90.0)
+    
+    # A circle that reaches a pole covers every meridian
+    if max_lat >= 90.0 or min_lat <= -90.0:
+        return min_lat, max_lat, -180.0, 180.0
+    
+    # Widest longitude reach of the circle, which is wider than its extent along the parallel
+    ratio = math.sin(angular_radius) / math.cos(math.radians(latitude))
+    if ratio >= 1.0:
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(math.asin(ratio))
+    if longitude - dlon < -180.0 or longitude + dlon > 180.0:
+        # Crosses the antimeridian, fall back to the full longitude range
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, longitude - dlon, longitude + dlon
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a quoted prefix"""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+
+def _nearest_within(latitude: float, longitude: float, radius_km: float,
+                    candidates: List[Tuple[int, float, float]]) -> List[Tuple[int, float]]:
+    """Filter (id, latitude, longitude) candidates to those within radius_km using NumPy
+    
+    Returns (id, distance_km) pairs sorted by distance.
+    """
+    if not candidates:
+        return []
+    
+    ids, lats, lons = zip(*candidates)
+    phi1 = np.radians(latitude)
+    phi2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.asarray(lons, dtype=np.float64) - longitude)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    distances = 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    
+    within = np.flatnonzero(distances <= radius_km)
+    order = within[np.argsort(distances[within], kind="stable")]
+    return [(ids[i], float(distances[i])) for i in order]
+
+
+@dataclass(slots=True)
 class SavedPlace:
     """Data model for a Google Maps saved place"""
     id: Optional[int] = None
@@ -35,10 +234,22 @@ class SavedPlace:
             self.photos = []
         if self.tags is None:
             self.tags = []
-        if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
-        if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+        if self.created_at is None or self.updated_at is None:
+            now = datetime.now().isoformat()
+            if self.created_at is None:
+                self.created_at = now
+            if self.updated_at is None:
+                self.updated_at = now
+    
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Return the place as a dict, optionally limited to the given field names"""
+        if fields is None:
+            fields = self.__slots__
+        return {name: getattr(self, name) for name in fields}
+
+
+# Fields written by export_places_to_json; the database ID is local to this database
+EXPORT_FIELDS = tuple(name for name in SavedPlace.__slots__ if name != "id")
 
 
 class GoogleMapsDatabase:
@@ -46,19 +257,81 @@ class GoogleMapsDatabase:
     
     def __init__(self, db_path: str = "data/google_maps_places.db"):
         self.db_path = db_path
+        self._wal_enabled = False
         # Ensure the directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # One long-lived connection shared by all calls; FastMCP may call tools from worker
+        # threads, so access is serialized with a lock instead of sqlite's thread check.
+        self._lock = threading.RLock()
+        self._conn = self._connect()
         self.init_database()
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Get a database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+    def _connect(self) -> sqlite3.Connection:
+        """Open the underlying connection and apply the per-connection pragmas"""
+        # Autocommit mode: single statements commit on their own and multi-statement writes
+        # use transaction(), which avoids the driver's implicit BEGIN before every write
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        # One function call per row instead of a chain of SQL trig functions
+        conn.create_function("haversine", 4, _haversine_km, deterministic=True)
         return conn
     
+    @contextmanager
+    def get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Get the shared database connection"""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one write transaction, rolling back on error"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                # Some errors (e.g. SQLITE_FULL) already roll the transaction back
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed reads in one read transaction so they all see the same data
+        
+        Other processes may write to the file between autocommit statements, so reads
+        that depend on each other's results must share a snapshot.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            finally:
+                if self._conn.in_transaction:
+                    self._conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Close the shared database connection"""
+        conn = getattr(self, "_conn", None)
+        if conn is not None:
+            conn.close()
+            self._conn = None
+    
+    def __del__(self):
+        self.close()
+    
     def init_database(self) -> None:
         """Initialize the database with the required tables"""
-        with self.get_connection() as conn:
+        # WAL mode is persistent in the database file, so it only needs to be set once; it
+        # cannot be changed inside a transaction
+        if not self._wal_enabled:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_enabled = True
+        
+        with self.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS saved_places (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -87,46 +360,171 @@ class GoogleMapsDatabase:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_location ON saved_places(latitude, longitude)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_name ON saved_places(name)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON saved_places(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rating ON saved_places(rating) WHERE rating IS NOT NULL")
             
-            conn.commit()
+            # R-tree over the coordinates, kept in sync by triggers, for bounding-box prefilters
+            rtree_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'saved_places_rtree'"
+            ).fetchone()
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS saved_places_rtree
+                USING rtree(id, minLat, maxLat, minLon, maxLon)
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_rtree_insert AFTER INSERT ON saved_places BEGIN
+                    INSERT INTO saved_places_rtree (id, minLat, maxLat, minLon, maxLon)
+                    VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_rtree_update
+                AFTER UPDATE OF latitude, longitude ON saved_places BEGIN
+                    UPDATE saved_places_rtree
+                    SET minLat = NEW.latitude, maxLat = NEW.latitude,
+                        minLon = NEW.longitude, maxLon = NEW.longitude
+                    WHERE id = NEW.id;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_rtree_delete AFTER DELETE ON saved_places BEGIN
+                    DELETE FROM saved_places_rtree WHERE id = OLD.id;
+                END
+            """)
+            if not rtree_exists:
+                conn.execute("""
+                    INSERT INTO saved_places_rtree (id, minLat, maxLat, minLon, maxLon)
+                    SELECT id, latitude, latitude, longitude, longitude FROM saved_places
+                """)
+            
+            # Normalized tags, kept in sync by triggers, so tag lookups are index seeks. Tags
+            # compare case-insensitively (ASCII), as the LIKE match on the JSON column did.
+            place_tags_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'place_tags'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_tags (
+                    place_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL COLLATE NOCASE,
+                    PRIMARY KEY (tag, place_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_place_tags_place_id ON place_tags(place_id)")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS place_tags_insert AFTER INSERT ON saved_places BEGIN
+                    INSERT OR IGNORE INTO place_tags (place_id, tag)
+                    SELECT DISTINCT NEW.id, value FROM json_each(NEW.tags) WHERE value IS NOT NULL;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS place_tags_update AFTER UPDATE OF tags ON saved_places BEGIN
+                    DELETE FROM place_tags WHERE place_id = OLD.id;
+                    INSERT OR IGNORE INTO place_tags (place_id, tag)
+                    SELECT DISTINCT NEW.id, value FROM json_each(NEW.tags) WHERE value IS NOT NULL;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS place_tags_delete AFTER DELETE ON saved_places BEGIN
+                    DELETE FROM place_tags WHERE place_id = OLD.id;
+                END
+            """)
+            if not place_tags_exists:
+                conn.execute("""
+                    INSERT OR IGNORE INTO place_tags (place_id, tag)
+                    SELECT DISTINCT sp.id, t.value FROM saved_places sp, json_each(sp.tags) t
+                    WHERE t.value IS NOT NULL
+                """)
+            
+            # Full-text index over the searchable columns, kept in sync by triggers
+            fts_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'saved_places_fts'"
+            ).fetchone()
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS saved_places_fts USING fts5(
+                    name, address, tags,
+                    content='saved_places', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_fts_insert AFTER INSERT ON saved_places BEGIN
+                    INSERT INTO saved_places_fts (rowid, name, address, tags)
+                    VALUES (NEW.id, NEW.name, NEW.address, NEW.tags);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_fts_update
+                AFTER UPDATE OF name, address, tags ON saved_places BEGIN
+                    INSERT INTO saved_places_fts (saved_places_fts, rowid, name, address, tags)
+                    VALUES ('delete', OLD.id, OLD.name, OLD.address, OLD.tags);
+                    INSERT INTO saved_places_fts (rowid, name, address, tags)
+                    VALUES (NEW.id, NEW.name, NEW.address, NEW.tags);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS saved_places_fts_delete AFTER DELETE ON saved_places BEGIN
+                    INSERT INTO saved_places_fts (saved_places_fts, rowid, name, address, tags)
+                    VALUES ('delete', OLD.id, OLD.name, OLD.address, OLD.tags);
+                END
+            """)
+            if not fts_exists:
+                conn.execute("INSERT INTO saved_places_fts (saved_places_fts) VALUES ('rebuild')")
     
     def save_place(self, place: SavedPlace) -> int:
         """Save a place to the database and return its ID"""
         place.updated_at = datetime.now().isoformat()
         
+        if place.place_id is None:
+            return self._insert_new(place)
+        return self._upsert_by_place_id(place)
+    
+    def _insert_new(self, place: SavedPlace) -> int:
+        """Insert a place that has no Google Place ID and return its ID"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT OR REPLACE INTO saved_places 
-                (name, address, latitude, longitude, place_id, types, rating, 
-                 user_ratings_total, price_level, website, phone_number, 
-                 opening_hours, photos, notes, tags, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                place.name,
-                place.address,
-                place.latitude,
-                place.longitude,
-                place.place_id,
-                json.dumps(place.types),
-                place.rating,
-                place.user_ratings_total,
-                place.price_level,
-                place.website,
-                place.phone_number,
-                json.dumps(place.opening_hours) if place.opening_hours else None,
-                json.dumps(place.photos),
-                place.notes,
-                json.dumps(place.tags),
-                place.created_at,
-                place.updated_at
-            ))
-            conn.commit()
+            cursor = conn.execute(_SQL_INSERT_PLACE, self._place_to_row(place))
             return cursor.lastrowid
     
+    def _upsert_by_place_id(self, place: SavedPlace) -> int:
+        """Insert a place, or update the one with the same Google Place ID, and return its ID"""
+        with self.get_connection() as conn:
+            # fetchall() runs the statement to completion so the autocommit write is committed
+            rows = conn.execute(_SQL_UPSERT_PLACE_RETURNING_ID, self._place_to_row(place)).fetchall()
+            return rows[0][0]
+    
+    def save_places_bulk(self, places: List[SavedPlace], chunk_size: int = 500) -> List[Tuple[SavedPlace, Exception]]:
+        """Save many places in batched transactions and return the places that failed
+        
+        Each chunk is written with a single executemany inside one transaction. If a
+        chunk fails it is rolled back and retried row by row, so one bad place does not
+        prevent the rest of its chunk from being saved.
+        """
+        failures = []
+        now = datetime.now().isoformat()
+        
+        for start in range(0, len(places), chunk_size):
+            chunk = places[start:start + chunk_size]
+            for place in chunk:
+                place.updated_at = now
+            
+            try:
+                with self.transaction() as conn:
+                    conn.executemany(_SQL_UPSERT_PLACE, [self._place_to_row(place) for place in chunk])
+                continue
+            except Exception:
+                pass
+            
+            with self.get_connection() as conn:
+                for place in chunk:
+                    try:
+                        conn.execute(_SQL_UPSERT_PLACE, self._place_to_row(place))
+                    except Exception as e:
+                        failures.append((place, e))
+        
+        return failures
+    
     def get_place(self, place_id: int) -> Optional[SavedPlace]:
         """Get a place by its database ID"""
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM saved_places WHERE id = ?", (place_id,)).fetchone()
+            row = conn.execute(_SQL_GET_BY_ID, (place_id,)).fetchone()
             if row:
                 return self._row_to_place(row)
             return None
@@ -134,152 +532,207 @@ class GoogleMapsDatabase:
     def get_place_by_google_id(self, google_place_id: str) -> Optional[SavedPlace]:
         """Get a place by its Google Place ID"""
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM saved_places WHERE place_id = ?", (google_place_id,)).fetchone()
+            row = conn.execute(_SQL_GET_BY_PLACE_ID, (google_place_id,)).fetchone()
             if row:
                 return self._row_to_place(row)
             return None
     
     def get_all_places(self, limit: Optional[int] = None, offset: int = 0) -> List[SavedPlace]:
         """Get all saved places with optional pagination"""
+        return list(self.iter_rows(limit=limit, offset=offset))
+    
+    def iter_rows(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[SavedPlace]:
+        """Iterate over saved places, newest first, without loading them all into memory
+        
+        The connection stays locked while the iterator is open, so consume it promptly.
+        """
         with self.get_connection() as conn:
-            query = "SELECT * FROM saved_places ORDER BY created_at DESC"
-            params = []
-            
             if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+                cursor = conn.execute(_SQL_ALL_PLACES_PAGE, (limit, offset))
+            else:
+                cursor = conn.execute(_SQL_ALL_PLACES)
             
-            rows = conn.execute(query, params).fetchall()
-            return [self._row_to_place(row) for row in rows]
+            for row in cursor:
+                yield self._row_to_place(row)
     
     def search_places(self, query: str, limit: Optional[int] = None) -> List[SavedPlace]:
-        """Search places by name, address, or tags"""
+        """Search places by name, address, or tags, best matches first
+        
+        Every word of the query must match the start of a word in one of the
+        searched columns. An empty query returns all places.
+        """
+        match = _fts_query(query)
+        if not match:
+            return self.get_all_places(limit=limit)
+        
         with self.get_connection() as conn:
-            search_query = """
-                SELECT * FROM saved_places 
-                WHERE name LIKE ? OR address LIKE ? OR tags LIKE ?
-                ORDER BY created_at DESC
-            """
-            params = [f"%{query}%", f"%{query}%", f"%{query}%"]
-            
             if limit:
-                search_query += " LIMIT ?"
-                params.append(limit)
-            
-            rows = conn.execute(search_query, params).fetchall()
+                rows = conn.execute(_SQL_SEARCH_LIMIT, (match, limit)).fetchall()
+            else:
+                rows = conn.execute(_SQL_SEARCH, (match,)).fetchall()
             return [self._row_to_place(row) for row in rows]
     
-    def get_places_by_location(self, latitude: float, longitude: float, radius_km: float = 10.0) -> List[SavedPlace]:
-        """Get places within a radius of the given coordinates"""
-        with self.get_connection() as conn:
-            # Using Haversine formula for distance calculation
-            query = """
-                SELECT *, 
-                (6371 * acos(cos(radians(?)) * cos(radians(latitude)) * 
-                cos(radians(longitude) - radians(?)) + sin(radians(?)) * 
-                sin(radians(latitude)))) AS distance
-                FROM saved_places 
-                WHERE distance <= ?
-                ORDER BY distance
-            """
-            rows = conn.execute(query, (latitude, longitude, latitude, radius_km)).fetchall()
-            return [self._row_to_place(row) for row in rows]
+    def get_places_by_location(self, latitude: float, longitude: float,
+                               radius_km: float = 10.0) -> List[Tuple[SavedPlace, float]]:
+        """Get (place, distance_km) pairs for places within a radius, nearest first"""
+        with self.snapshot() as conn:
+            nearby = self._nearby_ids(conn, latitude, longitude, radius_km)
+            # The ids are bound as one JSON array so the statement text never changes
+            ids = json_dumps([place_id for place_id, _ in nearby])
+            rows_by_id = {row[0]: row for row in conn.execute(_SQL_GET_BY_IDS, (ids,))}
+        
+        return [(self._row_to_place(rows_by_id[place_id]), distance) for place_id, distance in nearby]
     
     def get_places_by_tag(self, tag: str) -> List[SavedPlace]:
-        """Get all places with a specific tag"""
+        """Get all places with a specific tag, ignoring ASCII case"""
         with self.get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM saved_places WHERE tags LIKE ? ORDER BY created_at DESC",
-                (f'%"{tag}"%',)
-            ).fetchall()
+            rows = conn.execute(_SQL_PLACES_BY_TAG, (tag,)).fetchall()
             return [self._row_to_place(row) for row in rows]
     
+    def list_places_summary(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get the SUMMARY_FIELDS of all saved places as dicts, like get_all_places
+        
+        Only the summary columns are read and only tags are decoded.
+        """
+        with self.get_connection() as conn:
+            if limit:
+                rows = conn.execute(_SQL_ALL_SUMMARIES_PAGE, (limit, offset)).fetchall()
+            else:
+                rows = conn.execute(_SQL_ALL_SUMMARIES).fetchall()
+            return [self._row_to_summary(row) for row in rows]
+    
+    def search_places_summary(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search places like search_places, returning SUMMARY_FIELDS dicts"""
+        match = _fts_query(query)
+        if not match:
+            return self.list_places_summary(limit=limit)
+        
+        with self.get_connection() as conn:
+            if limit:
+                rows = conn.execute(_SQL_SEARCH_SUMMARIES_LIMIT, (match, limit)).fetchall()
+            else:
+                rows = conn.execute(_SQL_SEARCH_SUMMARIES, (match,)).fetchall()
+            return [self._row_to_summary(row) for row in rows]
+    
+    def get_places_by_tag_summary(self, tag: str) -> List[Dict[str, Any]]:
+        """Get places with a tag like get_places_by_tag, returning SUMMARY_FIELDS dicts"""
+        with self.get_connection() as conn:
+            rows = conn.execute(_SQL_SUMMARIES_BY_TAG, (tag,)).fetchall()
+            return [self._row_to_summary(row) for row in rows]
+    
+    def list_nearby_places_summary(self, latitude: float, longitude: float,
+                                   radius_km: float = 10.0) -> List[Tuple[Dict[str, Any], float]]:
+        """Get (summary, distance_km) pairs for places within a radius, nearest first"""
+        with self.snapshot() as conn:
+            nearby = self._nearby_ids(conn, latitude, longitude, radius_km)
+            ids = json_dumps([place_id for place_id, _ in nearby])
+            rows_by_id = {row[0]: row for row in conn.execute(_SQL_SUMMARIES_BY_IDS, (ids,))}
+        
+        return [(self._row_to_summary(rows_by_id[place_id]), distance) for place_id, distance in nearby]
+    
     def update_place(self, place_id: int, **updates) -> bool:
         """Update a place with the given fields"""
         if not updates:
             return False
         
-        place = self.get_place(place_id)
-        if not place:
-            return False
+        # Only the given columns are written; unknown fields are ignored
+        columns = [column for column in _UPDATABLE_COLUMNS if column in updates]
+        params = []
+        for column in columns:
+            value = updates[column]
+            if column in _JSON_COLUMNS:
+                value = _encode_json(value)
+            params.append(value)
         
-        # Update the place object
-        for key, value in updates.items():
-            if hasattr(place, key):
-                setattr(place, key, value)
-        
-        place.updated_at = datetime.now().isoformat()
+        assignments = "".join(f"{column} = ?, " for column in columns)
+        params.extend([datetime.now().isoformat(), place_id])
         
         with self.get_connection() as conn:
-            conn.execute("""
-                UPDATE saved_places SET
-                name = ?, address = ?, latitude = ?, longitude = ?, place_id = ?,
-                types = ?, rating = ?, user_ratings_total = ?, price_level = ?,
-                website = ?, phone_number = ?, opening_hours = ?, photos = ?,
-                notes = ?, tags = ?, updated_at = ?
-                WHERE id = ?
-            """, (
-                place.name, place.address, place.latitude, place.longitude, place.place_id,
-                json.dumps(place.types), place.rating, place.user_ratings_total, place.price_level,
-                place.website, place.phone_number, 
-                json.dumps(place.opening_hours) if place.opening_hours else None,
-                json.dumps(place.photos), place.notes, json.dumps(place.tags),
-                place.updated_at, place_id
-            ))
-            conn.commit()
-            return True
+            cursor = conn.execute(f"UPDATE saved_places SET {assignments}updated_at = ? WHERE id = ?", params)
+            return cursor.rowcount > 0
     
     def delete_place(self, place_id: int) -> bool:
         """Delete a place by its ID"""
         with self.get_connection() as conn:
-            cursor = conn.execute("DELETE FROM saved_places WHERE id = ?", (place_id,))
-            conn.commit()
+            cursor = conn.execute(_SQL_DELETE_PLACE, (place_id,))
             return cursor.rowcount > 0
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
         with self.get_connection() as conn:
-            total_places = conn.execute("SELECT COUNT(*) FROM saved_places").fetchone()[0]
+            total_places, avg_rating = conn.execute(_SQL_PLACE_TOTALS).fetchone()
             
             # Get most common tags
-            all_tags = []
-            rows = conn.execute("SELECT tags FROM saved_places WHERE tags IS NOT NULL").fetchall()
-            for row in rows:
-                tags = json.loads(row['tags'])
-                all_tags.extend(tags)
-            
-            tag_counts = {}
-            for tag in all_tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            
-            # Get places by rating
-            avg_rating = conn.execute("SELECT AVG(rating) FROM saved_places WHERE rating IS NOT NULL").fetchone()[0]
+            most_common_tags = conn.execute(_SQL_TOP_TAGS).fetchall()
             
             return {
                 "total_places": total_places,
                 "average_rating": round(avg_rating, 2) if avg_rating else None,
-                "most_common_tags": sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                "most_common_tags": most_common_tags
             }
     
-    def _row_to_place(self, row: sqlite3.Row) -> SavedPlace:
-        """Convert a database row to a SavedPlace object"""
+    def _nearby_ids(self, conn: sqlite3.Connection, latitude: float, longitude: float,
+                    radius_km: float) -> List[Tuple[int, float]]:
+        """Get (id, distance_km) pairs for places within a radius, nearest first"""
+        min_lat, max_lat, min_lon, max_lon = _bounding_box(latitude, longitude, radius_km)
+        
+        # The R-tree narrows the candidates to the bounding box, exact distances are
+        # only computed for the coordinates that survive it
+        if np is not None:
+            candidates = conn.execute(
+                _SQL_LOCATION_CANDIDATES, (min_lat, max_lat, min_lon, max_lon)
+            ).fetchall()
+            return _nearest_within(latitude, longitude, radius_km, candidates)
+        
+        return conn.execute(
+            _SQL_LOCATION_NEARBY,
+            (latitude, longitude, min_lat, max_lat, min_lon, max_lon, radius_km)
+        ).fetchall()
+    
+    def _place_to_row(self, place: SavedPlace) -> Tuple[Any, ...]:
+        """Convert a SavedPlace object to the parameter tuple used by the insert statements"""
+        return (
+            place.name,
+            place.address,
+            place.latitude,
+            place.longitude,
+            place.place_id,
+            _encode_json(place.types),
+            place.rating,
+            place.user_ratings_total,
+            place.price_level,
+            place.website,
+            place.phone_number,
+            _encode_json(place.opening_hours),
+            _encode_json(place.photos),
+            place.notes,
+            _encode_json(place.tags),
+            place.created_at,
+            place.updated_at
+        )
+    
+    def _row_to_place(self, row: Tuple[Any, ...]) -> SavedPlace:
+        """Convert a database row to a SavedPlace object
+        
+        Rows come from SELECT * and are unpacked positionally, so the order below
+        must match the saved_places columns (which match the SavedPlace fields).
+        """
+        (id_, name, address, latitude, longitude, place_id, types, rating,
+         user_ratings_total, price_level, website, phone_number, opening_hours,
+         photos, notes, tags, created_at, updated_at) = row
         return SavedPlace(
-            id=row['id'],
-            name=row['name'],
-            address=row['address'],
-            latitude=row['latitude'],
-            longitude=row['longitude'],
-            place_id=row['place_id'],
-            types=json.loads(row['types']) if row['types'] else [],
-            rating=row['rating'],
-            user_ratings_total=row['user_ratings_total'],
-            price_level=row['price_level'],
-            website=row['website'],
-            phone_number=row['phone_number'],
-            opening_hours=json.loads(row['opening_hours']) if row['opening_hours'] else None,
-            photos=json.loads(row['photos']) if row['photos'] else [],
-            notes=row['notes'],
-            tags=json.loads(row['tags']) if row['tags'] else [],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
+            id_, name, address, latitude, longitude, place_id,
+            _json_loads(types) if types else [],
+            rating, user_ratings_total, price_level, website, phone_number,
+            _json_loads(opening_hours) if opening_hours else None,
+            _json_loads(photos) if photos else [],
+            notes,
+            _json_loads(tags) if tags else [],
+            created_at, updated_at
         )
+    
+    def _row_to_summary(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        """Convert a row of SUMMARY_FIELDS columns to a dict"""
+        summary = dict(zip(SUMMARY_FIELDS, row))
+        summary["tags"] = _json_loads(summary["tags"]) if summary["tags"] else []
+        return summary
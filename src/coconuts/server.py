@@ -1,6 +1,7 @@
 from mcp.server.fastmcp import FastMCP
-from coconuts.database import GoogleMapsDatabase, SavedPlace
+from coconuts.database import EXPORT_FIELDS, GoogleMapsDatabase, SavedPlace, json_dumps
 from typing import List, Dict, Any, Optional
+from datetime import datetime
 import json
 
 # Create an MCP server
@@ -60,26 +61,7 @@ def get_place(place_id: int) -> Dict[str, Any]:
     if place:
         return {
             "success": True,
-            "place": {
-                "id": place.id,
-                "name": place.name,
-                "address": place.address,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "place_id": place.place_id,
-                "types": place.types,
-                "rating": place.rating,
-                "user_ratings_total": place.user_ratings_total,
-                "price_level": place.price_level,
-                "website": place.website,
-                "phone_number": place.phone_number,
-                "opening_hours": place.opening_hours,
-                "photos": place.photos,
-                "notes": place.notes,
-                "tags": place.tags,
-                "created_at": place.created_at,
-                "updated_at": place.updated_at
-            }
+            "place": place.to_dict()
         }
     else:
         return {
@@ -90,68 +72,35 @@ def get_place(place_id: int) -> Dict[str, Any]:
 @mcp.tool()
 def get_all_places(limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
     """Get all saved places with optional pagination"""
-    places = db.get_all_places(limit=limit, offset=offset)
+    places = db.list_places_summary(limit=limit, offset=offset)
     return {
         "success": True,
-        "places": [
-            {
-                "id": place.id,
-                "name": place.name,
-                "address": place.address,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "rating": place.rating,
-                "tags": place.tags,
-                "created_at": place.created_at
-            }
-            for place in places
-        ],
+        "places": places,
         "total": len(places)
     }
 
 @mcp.tool()
 def search_places(query: str, limit: Optional[int] = None) -> Dict[str, Any]:
     """Search saved places by name, address, or tags"""
-    places = db.search_places(query, limit=limit)
+    places = db.search_places_summary(query, limit=limit)
     return {
         "success": True,
         "query": query,
-        "places": [
-            {
-                "id": place.id,
-                "name": place.name,
-                "address": place.address,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "rating": place.rating,
-                "tags": place.tags,
-                "created_at": place.created_at
-            }
-            for place in places
-        ],
+        "places": places,
         "total": len(places)
     }
 
 @mcp.tool()
 def get_places_by_location(latitude: float, longitude: float, radius_km: float = 10.0) -> Dict[str, Any]:
     """Get places within a radius of the given coordinates"""
-    places = db.get_places_by_location(latitude, longitude, radius_km)
+    places = db.list_nearby_places_summary(latitude, longitude, radius_km)
     return {
         "success": True,
         "location": {"latitude": latitude, "longitude": longitude},
         "radius_km": radius_km,
         "places": [
-            {
-                "id": place.id,
-                "name": place.name,
-                "address": place.address,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "rating": place.rating,
-                "tags": place.tags,
-                "distance_km": getattr(place, 'distance', None)
-            }
-            for place in places
+            {**place, "distance_km": distance}
+            for place, distance in places
         ],
         "total": len(places)
     }
@@ -159,23 +108,11 @@ def get_places_by_location(latitude: float, longitude: float, radius_km: float =
 @mcp.tool()
 def get_places_by_tag(tag: str) -> Dict[str, Any]:
     """Get all places with a specific tag"""
-    places = db.get_places_by_tag(tag)
+    places = db.get_places_by_tag_summary(tag)
     return {
         "success": True,
         "tag": tag,
-        "places": [
-            {
-                "id": place.id,
-                "name": place.name,
-                "address": place.address,
-                "latitude": place.latitude,
-                "longitude": place.longitude,
-                "rating": place.rating,
-                "tags": place.tags,
-                "created_at": place.created_at
-            }
-            for place in places
-        ],
+        "places": places,
         "total": len(places)
     }
 
@@ -230,17 +167,22 @@ def import_places_from_json(json_data: str) -> Dict[str, Any]:
                 "message": "JSON data must be an array of places"
             }
         
-        imported_count = 0
+        places = []
         errors = []
+        # One timestamp for the whole import instead of one per place
+        now = datetime.now().isoformat()
         
         for place_data in places_data:
             try:
-                place = SavedPlace(**place_data)
-                db.save_place(place)
-                imported_count += 1
+                places.append(SavedPlace(**{"created_at": now, "updated_at": now, **place_data}))
             except Exception as e:
                 errors.append(f"Error importing place '{place_data.get('name', 'Unknown')}': {str(e)}")
         
+        failures = db.save_places_bulk(places)
+        for place, e in failures:
+            errors.append(f"Error importing place '{place.name}': {str(e)}")
+        imported_count = len(places) - len(failures)
+        
         return {
             "success": True,
             "message": f"Imported {imported_count} places successfully",
@@ -256,34 +198,11 @@ def import_places_from_json(json_data: str) -> Dict[str, Any]:
 @mcp.tool()
 def export_places_to_json(limit: Optional[int] = None) -> Dict[str, Any]:
     """Export all saved places to JSON format"""
-    places = db.get_all_places(limit=limit)
-    places_data = []
-    
-    for place in places:
-        place_dict = {
-            "name": place.name,
-            "address": place.address,
-            "latitude": place.latitude,
-            "longitude": place.longitude,
-            "place_id": place.place_id,
-            "types": place.types,
-            "rating": place.rating,
-            "user_ratings_total": place.user_ratings_total,
-            "price_level": place.price_level,
-            "website": place.website,
-            "phone_number": place.phone_number,
-            "opening_hours": place.opening_hours,
-            "photos": place.photos,
-            "notes": place.notes,
-            "tags": place.tags,
-            "created_at": place.created_at,
-            "updated_at": place.updated_at
-        }
-        places_data.append(place_dict)
+    places_data = [place.to_dict(EXPORT_FIELDS) for place in db.iter_rows(limit=limit)]
     
     return {
         "success": True,
         "places": places_data,
         "total": len(places_data),
-        "json": json.dumps(places_data, indent=2)
+        "json": json_dumps(places_data, indent=True)
     }
\ No newline at end of file